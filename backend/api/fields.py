@@ -6,12 +6,42 @@ from django.core.files.base import ContentFile
 from rest_framework import serializers
 
 
-class Base64ImageField(serializers.ImageField):
+class AbsoluteImageField(serializers.ImageField):
+    """ImageField с абсолютным URL, префикс хоста считается раз на запрос"""
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        request = self.context.get('request')
+        url = value.url
+        if (
+            request is None
+            or not url.startswith('/')
+            or url.startswith('//')
+        ):
+            return super().to_representation(value)
+        prefix = getattr(request, '_absolute_url_prefix', None)
+        if prefix is None:
+            prefix = request.build_absolute_uri('/')[:-1]
+            request._absolute_url_prefix = prefix
+        return prefix + url
+
+
+class Base64ImageField(AbsoluteImageField):
     """Кастомное поле для обработки base64 изображений"""
 
+    def __init__(self, *args, max_size=None, **kwargs):
+        self.max_size = max_size
+        super().__init__(*args, **kwargs)
+
     def to_internal_value(self, data):
         if isinstance(data, str) and data.startswith('data:image'):
             format, imgstr = data.split(';base64,')
+            if self.max_size and len(imgstr) * 3 // 4 > self.max_size:
+                max_mb = self.max_size / (1024 * 1024)
+                raise serializers.ValidationError(
+                    f'Размер файла не должен превышать {max_mb:.1f} MB'
+                )
             decoded_file = base64.b64decode(imgstr)
             file_extension = imghdr.what(None, decoded_file)
             if not file_extension:
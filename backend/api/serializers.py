@@ -1,9 +1,14 @@
 from collections import Counter
+from functools import cached_property
+from io import BytesIO
 
+from django.core.files.base import ContentFile
 from django.core.validators import MinValueValidator
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from djoser.serializers import UserSerializer as DjoserUserSerializer
+from drf_serializer_cache import SerializerCacheMixin
+from PIL import Image, ImageOps
 from rest_framework import serializers
 
 from recipes.models import (
@@ -17,34 +22,48 @@ from recipes.models import (
     MIN_COOKING_TIME,
     MIN_INGREDIENT_AMOUNT
 )
-from .fields import Base64ImageField
+from .fields import AbsoluteImageField, Base64ImageField
 
 
 User = get_user_model()
 
 
-class UserSerializer(DjoserUserSerializer):
+class UserSerializer(SerializerCacheMixin, DjoserUserSerializer):
     """Сериализатор для пользователя."""
     is_subscribed = serializers.SerializerMethodField()
+    avatar = AbsoluteImageField(read_only=True)
 
     class Meta(DjoserUserSerializer.Meta):
         fields = [*DjoserUserSerializer.Meta.fields, 'is_subscribed', 'avatar']
         read_only_fields = fields
 
+    @cached_property
+    def _is_anonymous(self):
+        """Запрос сделан анонимным пользователем."""
+        request = self.context.get('request')
+        return not (request and request.user.is_authenticated)
+
     def get_is_subscribed(self, author):
         """Проверят подписан ли ползьватель на данного автора."""
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return Subscription.objects.filter(
-                user=request.user,
-                author=author
-            ).exists()
-        return False
+        if self._is_anonymous:
+            return False
+
+        is_subscribed = getattr(author, 'is_subscribed', None)
+        if is_subscribed is not None:
+            return is_subscribed
+
+        return Subscription.objects.filter(
+            user=self.context['request'].user,
+            author=author
+        ).exists()
 
 
 class SetAvatarSerializer(serializers.ModelSerializer):
     """Сериализатор для установки аватара."""
-    avatar = Base64ImageField(required=True)
+    avatar = Base64ImageField(
+        required=True,
+        max_size=settings.FOODGRAM['MAX_AVATAR_SIZE']
+    )
 
     class Meta:
         model = User
@@ -58,7 +77,37 @@ class SetAvatarSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 f'Размер файла не должен превышать {max_mb:.1f} MB'
             )
-        return avatar
+        return self.resize_avatar(avatar)
+
+    @staticmethod
+    def resize_avatar(avatar):
+        """Уменьшает аватар до размера, в котором он выводится."""
+        max_dimension = settings.FOODGRAM['AVATAR_MAX_DIMENSION']
+        avatar.seek(0)
+        with Image.open(avatar) as image:
+            # Проверяем до декодирования пикселей
+            if image.width * image.height > (
+                settings.FOODGRAM['AVATAR_MAX_PIXELS']
+            ):
+                raise serializers.ValidationError(
+                    'Слишком большое разрешение изображения'
+                )
+            if max(image.size) <= max_dimension:
+                avatar.seek(0)
+                return avatar
+            image_format = image.format
+            if image_format == 'JPEG':
+                image.draft(None, (max_dimension, max_dimension))
+            resized = ImageOps.exif_transpose(image)
+        resized.thumbnail((max_dimension, max_dimension))
+        save_kwargs = (
+            {'quality': settings.FOODGRAM['AVATAR_QUALITY']}
+            if image_format in ('JPEG', 'WEBP') else {}
+        )
+        buffer = BytesIO()
+        resized.save(buffer, format=image_format, **save_kwargs)
+        resized.close()
+        return ContentFile(buffer.getvalue(), name=avatar.name)
 
     def update(self, instance, validated_data):
         """Сохраняет новый аватар."""
@@ -67,8 +116,12 @@ class SetAvatarSerializer(serializers.ModelSerializer):
         return instance
 
 
-class RecipeShortSerializer(serializers.ModelSerializer):
+class RecipeShortSerializer(
+    SerializerCacheMixin, serializers.ModelSerializer
+):
     """Короткий сериализатор для вывода рецептов в подписках."""
+    image = AbsoluteImageField(read_only=True)
+
     class Meta:
         model = Recipe
         fields = ('id', 'name', 'image', 'cooking_time')
@@ -78,10 +131,7 @@ class RecipeShortSerializer(serializers.ModelSerializer):
 class UserWithRecipesSerializer(UserSerializer):
     """Сериализатор пользователя с рецептами и количеством рецептов."""
     recipes = serializers.SerializerMethodField()
-    recipes_count = serializers.IntegerField(
-        source='recipes.count',
-        read_only=True
-    )
+    recipes_count = serializers.IntegerField(read_only=True)
 
     class Meta(UserSerializer.Meta):
         fields = [*UserSerializer.Meta.fields, 'recipes', 'recipes_count']
@@ -89,20 +139,13 @@ class UserWithRecipesSerializer(UserSerializer):
 
     def get_recipes(self, user):
         """Список рецептов пользователя."""
-        request = self.context.get('request')
         recipes = user.recipes.all()
-
-        recipes_limit = (
-            request.query_params.get('recipes_limit') if request else None
-        )
-        try:
-            if recipes_limit is not None:
-                recipes = recipes[:int(recipes_limit)]
-        except (ValueError, TypeError):
-            pass
+        recipes_limit = self.context.get('recipes_limit')
+        if recipes_limit is not None:
+            recipes = recipes[:recipes_limit]
 
         return RecipeShortSerializer(
-            recipes, many=True, context={'request': request}
+            recipes, many=True, context=self.context
         ).data
 
 
@@ -174,7 +217,7 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'slug']
 
 
-class RecipeSerializer(serializers.ModelSerializer):
+class RecipeSerializer(SerializerCacheMixin, serializers.ModelSerializer):
     """Сериализатор для списка рецептов."""
     tags = TagSerializer(many=True, read_only=True)
     author = UserSerializer(read_only=True)
@@ -185,6 +228,7 @@ class RecipeSerializer(serializers.ModelSerializer):
     )
     is_favorited = serializers.SerializerMethodField()
     is_in_shopping_cart = serializers.SerializerMethodField()
+    image = AbsoluteImageField(read_only=True)
 
     class Meta:
         model = Recipe
@@ -282,6 +326,8 @@ class RecipeWriteSerializer(serializers.ModelSerializer):
 
 class RecipeMinifiedSerializer(serializers.ModelSerializer):
     """Сериализатор для минимального представления рецепта"""
+    image = AbsoluteImageField(read_only=True)
+
     class Meta:
         model = Recipe
         fields = ['id', 'name', 'image', 'cooking_time']
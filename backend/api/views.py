@@ -1,5 +1,6 @@
-from django.db.models import Sum
-from django.http import FileResponse
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Prefetch, Sum, Value
+from django.http import FileResponse, Http404
 from django.shortcuts import get_object_or_404
 from django.template.loader import render_to_string
 from django.urls import reverse
@@ -199,6 +200,51 @@ class UserViewSet(DjoserUserViewSet):
     queryset = User.objects.all()
     pagination_class = StandardPagination
     permission_classes = [permissions.AllowAny]
+    list_only_fields = (
+        'id', 'email', 'username', 'first_name', 'last_name', 'avatar'
+    )
+
+    def get_queryset(self):
+        """Набор полей и связанных данных под конкретное действие."""
+        queryset = super().get_queryset()
+        user = self.request.user
+        if self.action == 'subscriptions':
+            return queryset.filter(
+                subscriptions_for_author__user=user
+            ).only(
+                *self.list_only_fields, 'recipes_count'
+            ).annotate(
+                is_subscribed=Value(True)
+            ).prefetch_related(
+                Prefetch(
+                    'recipes',
+                    queryset=Recipe.objects.only(
+                        'id', 'name', 'image', 'cooking_time', 'author_id'
+                    )
+                )
+            )
+        if self.action in ('list', 'retrieve'):
+            queryset = queryset.only(*self.list_only_fields)
+            if user.is_authenticated:
+                queryset = queryset.annotate(
+                    is_subscribed=Exists(
+                        Subscription.objects.filter(
+                            user=user, author=OuterRef('pk')
+                        )
+                    )
+                )
+        return queryset
+
+    def get_serializer_context(self):
+        """Разбирает recipes_limit один раз на запрос."""
+        context = super().get_serializer_context()
+        try:
+            recipes_limit = int(self.request.query_params['recipes_limit'])
+        except (KeyError, ValueError):
+            return context
+        if recipes_limit >= 0:
+            context['recipes_limit'] = recipes_limit
+        return context
 
     @action(
         detail=False,
@@ -209,8 +255,11 @@ class UserViewSet(DjoserUserViewSet):
         """
         Получение данных текущего пользователя
         """
+        user = request.user
+        # На себя подписаться нельзя — как аннотация в get_queryset
+        user.is_subscribed = False
         return Response(
-            UserSerializer(request.user, context={'request': request}).data
+            UserSerializer(user, context=self.get_serializer_context()).data
         )
 
     @action(
@@ -251,36 +300,51 @@ class UserViewSet(DjoserUserViewSet):
     def subscribe(self, request, id=None):
         """Подписка и отписка на пользователя."""
         user = request.user
+        try:
+            author_id = int(id)
+        except ValueError:
+            raise Http404
 
         if request.method != 'POST':
-            get_object_or_404(Subscription, user=user, author_id=id).delete()
+            deleted, _ = Subscription.objects.filter(
+                user=user, author_id=author_id
+            ).delete()
+            if not deleted:
+                if not User.objects.filter(pk=author_id).exists():
+                    raise Http404
+                raise ValidationError(
+                    {'detail': 'Вы не подписаны на этого пользователя'}
+                )
             return Response(status=status.HTTP_204_NO_CONTENT)
 
-        if id == user.pk:
+        if author_id == user.pk:
             raise ValidationError({'detail': 'Нельзя подписаться на себя'})
 
-        author = get_object_or_404(User, pk=id)
+        with transaction.atomic():
+            author = get_object_or_404(
+                User.objects.only(*self.list_only_fields, 'recipes_count'),
+                pk=author_id
+            )
 
-        _, created = Subscription.objects.get_or_create(
-            user=user, author=author
-        )
-        if not created:
-            raise ValidationError(
-                {
-                    'detail': (
-                        f'Вы уже подписаны на пользователя '
-                        f'{author.username}'
-                    )
-                }
+            _, created = Subscription.objects.get_or_create(
+                user=user, author=author
             )
+            if not created:
+                raise ValidationError(
+                    {
+                        'detail': (
+                            f'Вы уже подписаны на пользователя '
+                            f'{author.username}'
+                        )
+                    }
+                )
 
-        return Response(
-            UserWithRecipesSerializer(
+            data = UserWithRecipesSerializer(
                 author,
-                context={'request': request}
-            ).data,
-            status=status.HTTP_201_CREATED
-        )
+                context=self.get_serializer_context()
+            ).data
+
+        return Response(data, status=status.HTTP_201_CREATED)
 
     @action(
         detail=False,
@@ -289,12 +353,9 @@ class UserViewSet(DjoserUserViewSet):
     )
     def subscriptions(self, request):
         """Подписки с пагинацией"""
-        user = request.user
-        author_ids = user.subscribers.values_list('author', flat=True)
-        queryset = User.objects.filter(id__in=author_ids)
-        page = self.paginate_queryset(queryset)
+        page = self.paginate_queryset(self.get_queryset())
         return self.get_paginated_response(
             UserWithRecipesSerializer(
-                page, many=True, context={'request': request}
+                page, many=True, context=self.get_serializer_context()
             ).data
         )
@@ -179,6 +179,9 @@ FOODGRAM = {
     'DEFAULT_PAGE_SIZE': 6,
     'MAX_PAGE_SIZE': 100,
     'MAX_AVATAR_SIZE': 2 * 1024 * 1024,
+    'AVATAR_MAX_DIMENSION': 192,
+    'AVATAR_MAX_PIXELS': 4096 * 4096,
+    'AVATAR_QUALITY': 85,
 }
 
 # Настройки для медиа-файлов
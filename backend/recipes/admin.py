@@ -2,8 +2,8 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import Group, User as AuthUser
 from django.contrib.admin import RelatedOnlyFieldListFilter
-from django.utils.safestring import mark_safe
-from django.db.models import Count
+from django.utils.safestring import SafeString, mark_safe
+from django.db.models import Prefetch
 from django import forms
 
 from .admin_filters import (
@@ -24,7 +24,22 @@ from .models import (
     User,
     Subscription
 )
-from .admin_mixins import RelatedCountAdminMixin
+from .admin_mixins import (
+    ChangeListAdminMixin,
+    RelatedCountAdminMixin,
+    related_count_subquery
+)
+
+
+AVATAR_FORM_PREVIEW_HTML = (
+    '<img src="{}" width="100" height="100" style="border-radius:50%;">'
+)
+AVATAR_LIST_PREVIEW_HTML = (
+    '<img src="{}" width="50" height="50" style="border-radius: 50%;">'
+)
+RECIPE_IMAGE_HTML = (
+    '<img src="{}" width="60" height="60" style="border-radius:6px;">'
+)
 
 
 admin.site.unregister(Group)
@@ -35,7 +50,7 @@ except admin.sites.NotRegistered:
 
 
 @admin.register(User)
-class UserAdmin(RelatedCountAdminMixin, BaseUserAdmin):
+class UserAdmin(ChangeListAdminMixin, BaseUserAdmin):
     list_display = (
         "id",
         "username",
@@ -57,10 +72,17 @@ class UserAdmin(RelatedCountAdminMixin, BaseUserAdmin):
     )
     search_fields = ("username", "email")
     ordering = ("id",)
-
-    related_name = "recipes"
-    count_field_name = "_recipes_count"
-    display_name = "Рецептов"
+    list_only_fields = (
+        "id",
+        "username",
+        "email",
+        "first_name",
+        "last_name",
+        "avatar",
+        "recipes_count",
+        "is_active",
+        "date_joined",
+    )
 
     readonly_fields = ('avatar_preview_form',)
 
@@ -70,45 +92,31 @@ class UserAdmin(RelatedCountAdminMixin, BaseUserAdmin):
         }),
     )
 
-    def get_queryset(self, request):
-        """Оптимизируем запрос — добавляем аннотации для подсчётов"""
-        queryset = super().get_queryset(request)
+    def get_queryset_annotations(self, queryset):
+        """Добавляем аннотации для подсчётов в списке пользователей"""
         return queryset.annotate(
-            _recipes_count=Count("recipes", distinct=True),
-            _subscriptions_count=Count("subscribers", distinct=True),
-            _followers_count=Count("subscriptions_for_author", distinct=True),
+            _subscriptions_count=related_count_subquery(Subscription, "user"),
+            _followers_count=related_count_subquery(Subscription, "author"),
         )
 
     @admin.display(description="Превью аватара")
-    @mark_safe
     def avatar_preview_form(self, obj):
         """Превью аватара на странице редактирования пользователя"""
         if obj.avatar:
-            return (
-                f'<img src="{obj.avatar.url}" width="100" height="100" '
-                'style="border-radius:50%;">'
-            )
+            return SafeString(AVATAR_FORM_PREVIEW_HTML.format(obj.avatar.url))
         return "—"
 
     @admin.display(description="Аватар")
-    @mark_safe
     def avatar_preview(self, obj):
         """Превью аватара в списке пользователей"""
-        if obj.avatar:
-            return (
-                f'<img src="{obj.avatar.url}" width="50" height="50" '
-                'style="border-radius: 50%;">'
-            )
+        if obj.avatar.name:
+            return SafeString(AVATAR_LIST_PREVIEW_HTML.format(obj.avatar.url))
         return "—"
 
     @admin.display(description="ФИО")
     def full_name(self, obj):
         return f"{obj.first_name} {obj.last_name}".strip()
 
-    @admin.display(description="Рецептов")
-    def recipes_count(self, obj):
-        return obj._recipes_count
-
     @admin.display(description="Подписок")
     def subscriptions_count(self, obj):
         return obj._subscriptions_count
@@ -143,7 +151,7 @@ class RecipeAdminForm(forms.ModelForm):
 @admin.register(Subscription)
 class SubscriptionAdmin(admin.ModelAdmin):
     list_display = ('subscription_key', 'user_username', 'author_username')
-    list_filter = ('user',)
+    list_filter = (('user', RelatedOnlyFieldListFilter),)
     search_fields = (
         'user__email', 'user__username', 'author__email', 'author__username'
     )
@@ -163,7 +171,7 @@ class SubscriptionAdmin(admin.ModelAdmin):
 
 @admin.register(Tag)
 class TagAdmin(RelatedCountAdminMixin, admin.ModelAdmin):
-    list_display = ("id", "name", "slug", "count_recipes")
+    list_display = ("id", "name", "slug", "related_count")
     search_fields = ("name", "slug")
     list_filter = (TagUsedInRecipesFilter,)
 
@@ -171,14 +179,10 @@ class TagAdmin(RelatedCountAdminMixin, admin.ModelAdmin):
     count_field_name = "_recipes_count"
     display_name = "Рецептов"
 
-    @admin.display(description="Рецептов")
-    def count_recipes(self, obj):
-        return getattr(obj, self.count_field_name, 0)
-
 
 @admin.register(Ingredient)
 class IngredientAdmin(RelatedCountAdminMixin, admin.ModelAdmin):
-    list_display = ("id", "name", "measurement_unit", "count_recipes")
+    list_display = ("id", "name", "measurement_unit", "related_count")
     search_fields = ("name", "measurement_unit")
     list_filter = ("measurement_unit", UsedInRecipesFilter)
 
@@ -186,10 +190,6 @@ class IngredientAdmin(RelatedCountAdminMixin, admin.ModelAdmin):
     count_field_name = "_recipes_count"
     display_name = "Рецептов"
 
-    @admin.display(description="Рецептов")
-    def count_recipes(self, obj):
-        return getattr(obj, self.count_field_name, 0)
-
 
 class RecipeIngredientInline(admin.TabularInline):
     model = RecipeIngredient
@@ -198,7 +198,7 @@ class RecipeIngredientInline(admin.TabularInline):
 
 
 @admin.register(Recipe)
-class RecipeAdmin(admin.ModelAdmin):
+class RecipeAdmin(ChangeListAdminMixin, admin.ModelAdmin):
     form = RecipeAdminForm
     list_display = (
         "id",
@@ -227,8 +227,21 @@ class RecipeAdmin(admin.ModelAdmin):
 
     inlines = (RecipeIngredientInline,)
 
+    def get_queryset_annotations(self, queryset):
+        """Подгружаем автора, продукты, теги и число добавлений в избранное"""
+        return queryset.select_related(
+            "author"
+        ).prefetch_related(
+            Prefetch(
+                "recipe_ingredients",
+                queryset=RecipeIngredient.objects.select_related("ingredient")
+            ),
+            "tags",
+        ).annotate(
+            _favorites_count=related_count_subquery(Favorite, "recipe")
+        )
+
     @admin.display(description=mark_safe("Время<br>мин"))
-    @mark_safe
     def cooking_time_display(self, recipe):
         return recipe.cooking_time
 
@@ -237,32 +250,26 @@ class RecipeAdmin(admin.ModelAdmin):
         return recipe.author.username
 
     @admin.display(description="Продукты")
-    @mark_safe
     def show_ingredients(self, recipe):
-        return "<br>".join(
+        return SafeString("<br>".join(
             f"{ri.ingredient.name} — {ri.amount} "
             f"{ri.ingredient.measurement_unit}"
             for ri in recipe.recipe_ingredients.all()
-        )
+        ))
 
     @admin.display(description="Теги")
-    @mark_safe
     def show_tags(self, recipe):
-        return "<br>".join(tag.name for tag in recipe.tags.all())
+        return SafeString("<br>".join(tag.name for tag in recipe.tags.all()))
 
     @admin.display(description="Картинка")
-    @mark_safe
     def show_image(self, recipe):
         if recipe.image:
-            return (
-                f'<img src="{recipe.image.url}" width="60" '
-                f'height="60" style="border-radius:6px;">'
-            )
+            return SafeString(RECIPE_IMAGE_HTML.format(recipe.image.url))
         return "—"
 
     @admin.display(description="В избранном")
     def favorites_count(self, recipe):
-        return recipe.favorites.count()
+        return recipe._favorites_count
 
     @admin.display(description="В избранном")
     def favorites_count_display(self, recipe):
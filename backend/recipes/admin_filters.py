@@ -1,5 +1,27 @@
 from django.contrib import admin
-from django.db.models import Count
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef
+
+from .models import Recipe, RecipeIngredient, Subscription
+
+COOKING_TIME_LIMITS_CACHE_KEY = "recipe_cooking_time_thresholds"
+COOKING_TIME_LIMITS_CACHE_TIMEOUT = 60 * 60
+
+
+def compute_cooking_time_limits():
+    """Границы быстрых и средних рецептов по времени готовки"""
+    cooking_times = list(
+        Recipe.objects
+        .order_by("cooking_time")
+        .values_list("cooking_time", flat=True)
+        .distinct()
+    )
+    count = len(cooking_times)
+
+    if count < 3:
+        return ()
+
+    return cooking_times[count // 3], cooking_times[2 * count // 3]
 
 
 class BaseUsedInRecipesFilter(admin.SimpleListFilter):
@@ -10,23 +32,25 @@ class BaseUsedInRecipesFilter(admin.SimpleListFilter):
         ("no", "Не используются"),
     )
 
-    RELATED_NAME = None
-    COUNT_FIELD = "used_count"
+    RELATED_MODEL = None
+    RELATED_FIELD = None
 
     def lookups(self, request, model_admin):
         return self.LOOKUPS
 
     def queryset(self, request, queryset):
-        queryset = queryset.annotate(
-            **{self.COUNT_FIELD: Count(self.RELATED_NAME)}
-        )
-
         value = self.value()
+        if value not in ("yes", "no"):
+            return queryset
+
+        used_in_recipes = Exists(
+            self.RELATED_MODEL.objects.filter(
+                **{self.RELATED_FIELD: OuterRef("pk")}
+            )
+        )
         if value == "yes":
-            return queryset.filter(**{f"{self.COUNT_FIELD}__gt": 0})
-        elif value == "no":
-            return queryset.filter(**{f"{self.COUNT_FIELD}": 0})
-        return queryset
+            return queryset.filter(used_in_recipes)
+        return queryset.filter(~used_in_recipes)
 
 
 class UsedInRecipesFilter(BaseUsedInRecipesFilter):
@@ -34,8 +58,8 @@ class UsedInRecipesFilter(BaseUsedInRecipesFilter):
     title = "Есть в рецептах"
     parameter_name = "used_in_recipes"
 
-    RELATED_NAME = "recipes"
-    COUNT_FIELD = "recipes_count"
+    RELATED_MODEL = RecipeIngredient
+    RELATED_FIELD = "ingredient"
 
 
 class TagUsedInRecipesFilter(BaseUsedInRecipesFilter):
@@ -43,8 +67,8 @@ class TagUsedInRecipesFilter(BaseUsedInRecipesFilter):
     title = "Есть в рецептах"
     parameter_name = "used_in_recipes"
 
-    RELATED_NAME = "recipes"
-    COUNT_FIELD = "recipe_count"
+    RELATED_MODEL = Recipe.tags.through
+    RELATED_FIELD = "tag"
 
 
 class CookingTimeFilter(admin.SimpleListFilter):
@@ -52,20 +76,18 @@ class CookingTimeFilter(admin.SimpleListFilter):
 
     title = "Время готовки"
     parameter_name = "cooking_time_group"
+    time_ranges = {}
 
     def lookups(self, request, model_admin):
-        cooking_times = (
-            model_admin.get_queryset(request)
-            .order_by("cooking_time")
-            .values_list("cooking_time", flat=True)
-            .distinct()
+        limits = cache.get_or_set(
+            COOKING_TIME_LIMITS_CACHE_KEY,
+            compute_cooking_time_limits,
+            COOKING_TIME_LIMITS_CACHE_TIMEOUT
         )
-
-        if cooking_times.count() < 3:
+        if not limits:
             return ()
 
-        fast_limit = cooking_times[cooking_times.count() // 3]
-        medium_limit = cooking_times[2 * cooking_times.count() // 3]
+        fast_limit, medium_limit = limits
 
         self.time_ranges = {
             "fast": (0, fast_limit),
@@ -99,10 +121,11 @@ class HasRecipesFilter(admin.SimpleListFilter):
         )
 
     def queryset(self, request, queryset):
+        has_recipes = Exists(Recipe.objects.filter(author_id=OuterRef("pk")))
         if self.value() == "yes":
-            return queryset.filter(recipes__isnull=False).distinct()
+            return queryset.filter(has_recipes)
         if self.value() == "no":
-            return queryset.filter(recipes__isnull=True)
+            return queryset.filter(~has_recipes)
         return queryset
 
 
@@ -118,10 +141,13 @@ class HasSubscriptionsFilter(admin.SimpleListFilter):
         )
 
     def queryset(self, request, queryset):
+        has_subscriptions = Exists(
+            Subscription.objects.filter(user_id=OuterRef("pk"))
+        )
         if self.value() == "yes":
-            return queryset.filter(subscribers__isnull=False).distinct()
+            return queryset.filter(has_subscriptions)
         if self.value() == "no":
-            return queryset.filter(subscribers__isnull=True)
+            return queryset.filter(~has_subscriptions)
         return queryset
 
 
@@ -137,10 +163,11 @@ class HasFollowersFilter(admin.SimpleListFilter):
         )
 
     def queryset(self, request, queryset):
+        has_followers = Exists(
+            Subscription.objects.filter(author_id=OuterRef("pk"))
+        )
         if self.value() == "yes":
-            return queryset.filter(
-                subscriptions_for_author__isnull=False
-            ).distinct()
+            return queryset.filter(has_followers)
         if self.value() == "no":
-            return queryset.filter(subscriptions_for_author__isnull=True)
+            return queryset.filter(~has_followers)
         return queryset
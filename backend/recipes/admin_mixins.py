@@ -1,4 +1,22 @@
-from django.db.models import Count
+from operator import attrgetter
+
+from django.contrib.admin.views.main import ChangeList
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def related_count_subquery(model, field_name):
+    """Подзапрос с количеством объектов model, ссылающихся на строку"""
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{field_name: OuterRef("pk")})
+            .order_by()
+            .values(field_name)
+            .annotate(count=Count("pk"))
+            .values("count")
+        ),
+        0,
+    )
 
 
 class RelatedCountAdminMixin:
@@ -6,6 +24,22 @@ class RelatedCountAdminMixin:
     related_name = None
     count_field_name = None
     display_name = None
+    count_distinct = False
+
+    def __init_subclass__(cls, **kwargs):
+        """Создаёт колонку related_count для list_display"""
+        super().__init_subclass__(**kwargs)
+        if not cls.count_field_name:
+            return
+
+        count_getter = attrgetter(cls.count_field_name)
+
+        def related_count(self, obj):
+            return count_getter(obj)
+
+        related_count.short_description = cls.display_name
+        related_count.admin_order_field = cls.count_field_name
+        cls.related_count = related_count
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
@@ -13,8 +47,34 @@ class RelatedCountAdminMixin:
         if self.related_name and self.count_field_name:
             qs = qs.annotate(
                 **{self.count_field_name: Count(
-                    self.related_name, distinct=True
+                    self.related_name, distinct=self.count_distinct
                 )}
             )
 
         return qs
+
+
+class AdminChangeList(ChangeList):
+    """Список объектов с аннотациями и выборкой только нужных колонок"""
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if self.model_admin.list_only_fields:
+            queryset = queryset.only(*self.model_admin.list_only_fields)
+        return self.model_admin.get_queryset_annotations(queryset)
+
+
+class ChangeListAdminMixin:
+    """Миксин для запросов, нужных только странице списка объектов.
+
+    Аннотации из get_queryset_annotations не попадают в формы
+    редактирования и удаления, а неиспользуемые аннотации Django
+    убирает из COUNT-запроса пагинатора.
+    """
+    list_only_fields = None
+
+    def get_queryset_annotations(self, queryset):
+        return queryset
+
+    def get_changelist(self, request, **kwargs):
+        return AdminChangeList
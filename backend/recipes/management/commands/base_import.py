@@ -1,5 +1,6 @@
-import json
+from itertools import islice
 
+import ijson
 from django.core.management.base import BaseCommand
 
 
@@ -8,6 +9,7 @@ class BaseImportCommand(BaseCommand):
 
     model = None
     filepath = None
+    batch_size = 1000
 
     def handle(self, *args, **kwargs):
         if not self.model or not self.filepath:
@@ -18,14 +20,20 @@ class BaseImportCommand(BaseCommand):
 
         try:
             full_path = f'data/{self.filepath}'
-            with open(full_path, encoding='utf-8') as f:
-                created = self.model.objects.bulk_create(
-                    self.model(**item) for item in json.load(f)
+            count_before = self.model.objects.count()
+            with open(full_path, 'rb') as f:
+                objects = (
+                    self.model(**item) for item in ijson.items(f, 'item')
                 )
+                while batch := list(islice(objects, self.batch_size)):
+                    self.model.objects.bulk_create(
+                        batch, ignore_conflicts=True
+                    )
+            created_count = self.model.objects.count() - count_before
 
             self.stdout.write(
                 self.style.SUCCESS(
-                    f"{len(created)} объектов {self.model.__name__} "
+                    f"{created_count} объектов {self.model.__name__} "
                     f"из файла {self.filepath} импортировано"
                 )
             )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from recipes.admin_mixins import related_count_subquery
+from recipes.models import Recipe, User
+
+
+class Command(BaseCommand):
+    help = "Пересчёт количества рецептов у пользователей"
+
+    def handle(self, *args, **kwargs):
+        updated = User.objects.update(
+            recipes_count=related_count_subquery(Recipe, 'author')
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Пересчитано пользователей: {updated}")
+        )
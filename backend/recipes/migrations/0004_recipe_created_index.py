@@ -0,0 +1,17 @@
+# Generated by Django 4.2.13 on 2026-10-14 18:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0003_recipe_cooking_time_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['-created', '-id'], name='recipe_created_desc_idx'),
+        ),
+    ]
@@ -1,8 +1,19 @@
 from django.core.validators import MinValueValidator, RegexValidator
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.conf import settings
 
+
+def trigram_index(field_name, name):
+    """GIN-индекс по триграммам для поиска через icontains"""
+    return GinIndex(
+        OpClass(Upper(field_name), name='gin_trgm_ops'),
+        name=name
+    )
+
+
 USERNAME_VALIDATOR = RegexValidator(
     regex=r'^[\w.@+-]+\Z',
     message='Username может содержать только буквы, цифры и @/./+/-/_'
@@ -36,6 +47,11 @@ class User(AbstractUser):
         blank=True,
         null=True
     )
+    recipes_count = models.PositiveIntegerField(
+        verbose_name='Рецептов',
+        default=0,
+        editable=False
+    )
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'first_name', 'last_name']
 
@@ -43,6 +59,10 @@ class User(AbstractUser):
         ordering = ('email',)
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
+        indexes = [
+            trigram_index('username', 'user_username_trgm'),
+            trigram_index('email', 'user_email_trgm'),
+        ]
 
     def __str__(self):
         return self.email
@@ -125,6 +145,9 @@ class Ingredient(models.Model):
                 name='unique_ingredient'
             )
         ]
+        indexes = [
+            trigram_index('name', 'ingredient_name_trgm'),
+        ]
 
     def __str__(self):
         return f'{self.name} ({self.measurement_unit})'
@@ -173,6 +196,17 @@ class Recipe(models.Model):
         verbose_name = 'Рецепт'
         verbose_name_plural = 'Рецепты'
         ordering = ('-created',)
+        indexes = [
+            trigram_index('name', 'recipe_name_trgm'),
+            models.Index(
+                fields=['cooking_time'],
+                name='recipe_cooking_time_idx'
+            ),
+            models.Index(
+                fields=['-created', '-id'],
+                name='recipe_created_desc_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
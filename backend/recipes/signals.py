@@ -0,0 +1,61 @@
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .admin_filters import COOKING_TIME_LIMITS_CACHE_KEY
+from .models import Recipe, User
+from .views import RECIPE_EXISTS_CACHE_KEY
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+def invalidate_recipe_cache(sender, instance, **kwargs):
+    """Сбрасывает закэшированные данные о рецептах"""
+    cache.delete_many([
+        COOKING_TIME_LIMITS_CACHE_KEY,
+        RECIPE_EXISTS_CACHE_KEY.format(instance.pk),
+    ])
+
+
+def increment_recipes_count(author_id):
+    User.objects.filter(pk=author_id).update(
+        recipes_count=F('recipes_count') + 1
+    )
+
+
+def decrement_recipes_count(author_id):
+    User.objects.filter(
+        pk=author_id, recipes_count__gt=0
+    ).update(recipes_count=F('recipes_count') - 1)
+
+
+@receiver(pre_save, sender=Recipe)
+def remember_recipe_author(sender, instance, **kwargs):
+    """Запоминает автора рецепта до сохранения"""
+    instance._previous_author_id = (
+        None if instance._state.adding
+        else Recipe.objects.filter(pk=instance.pk).values_list(
+            'author_id', flat=True
+        ).first()
+    )
+
+
+@receiver(post_save, sender=Recipe)
+def update_recipes_count_on_save(sender, instance, created, **kwargs):
+    """Обновляет счётчики при создании рецепта или смене автора"""
+    previous_author_id = getattr(instance, '_previous_author_id', None)
+    if created:
+        increment_recipes_count(instance.author_id)
+    elif (
+        previous_author_id is not None
+        and previous_author_id != instance.author_id
+    ):
+        decrement_recipes_count(previous_author_id)
+        increment_recipes_count(instance.author_id)
+
+
+@receiver(post_delete, sender=Recipe)
+def update_recipes_count_on_delete(sender, instance, **kwargs):
+    """Уменьшает счётчик рецептов автора"""
+    decrement_recipes_count(instance.author_id)
@@ -1,10 +1,25 @@
+from django.core.cache import cache
 from django.http import Http404
 from django.shortcuts import redirect
+from django.views.decorators.cache import cache_control
 
 from .models import Recipe
 
+RECIPE_EXISTS_CACHE_KEY = 'recipe_exists:{}'
+RECIPE_EXISTS_CACHE_TIMEOUT = 60 * 5
+SHORT_LINK_MAX_AGE = 60 * 60 * 24
 
+
+@cache_control(public=True, max_age=SHORT_LINK_MAX_AGE)
 def short_link_redirect(request, pk):
-    if not Recipe.objects.filter(pk=pk).exists():
+    # Конвертер <int:pk> уже отсекает нечисловые id, а нулевых не бывает
+    if pk < 1:
         raise Http404(f"Рецепт с id {pk} не найден")
-    return redirect(f'/recipes/{pk}/')
+    cache_key = RECIPE_EXISTS_CACHE_KEY.format(pk)
+    if not cache.get(cache_key):
+        # Промахи не кэшируем: кэш свой у каждого воркера, и сброс
+        # в сигнале не увидят остальные процессы.
+        if not Recipe.objects.filter(pk=pk).exists():
+            raise Http404(f"Рецепт с id {pk} не найден")
+        cache.set(cache_key, True, RECIPE_EXISTS_CACHE_TIMEOUT)
+    return redirect(f'/recipes/{pk}/', permanent=True)